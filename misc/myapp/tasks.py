@@ -1,13 +1,21 @@
 from invoke import task
 import requests
 
+# Reuse one session so repeated hits skip TCP connection setup
+_SESSION = requests.Session()
+
+@task
+def run_server(c, workers=8):
+    """Run the Flask app under gunicorn with gevent workers for concurrent requests."""
+    c.run(f"gunicorn -k gevent -w {workers} -b 127.0.0.1:5000 'src:create_app()'")
+
 @task
-def run_server(c):
-    """Run the Flask development server."""
+def run_dev_server(c):
+    """Run the single-threaded Flask development server (debug use only)."""
     c.run("flask run --app src --port 5000")
 
 @task
 def hit_endpoint(c):
     """Hit the example endpoint of the Flask app."""
-    response = requests.get("http://127.0.0.1:5000/example")
+    response = _SESSION.get("http://127.0.0.1:5000/example")
     print(f"Response: {response.text}")
\ No newline at end of file
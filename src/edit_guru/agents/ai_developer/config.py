@@ -8,15 +8,20 @@ class ConfigManager:
     def __init__(self):
         self.use_cwd = False
         self.base_path = None
+        self.base_real = None
+        self.base_sep = None
         self.initialized = False
 
     @classmethod
     def get_instance(cls):
-        if cls._instance is None:
-            cls._instance = ConfigManager()
+        # The singleton is created at import time (see module bottom), so this
+        # is a bare attribute load: no branch and no thread race
         return cls._instance
 
     def initialize(self, use_cwd: bool = False):
+        if self.initialized and use_cwd == self.use_cwd:
+            return  # base path already resolved for this mode; skip the git round-trip
+
         self.use_cwd = use_cwd
 
         if not use_cwd and not self._is_git_repo():
@@ -26,6 +31,9 @@ class ConfigManager:
             )
 
         self.base_path = self._resolve_base_path()
+        # Normalize once here so per-tool path checks are plain string compares
+        self.base_real = os.path.realpath(self.base_path)
+        self.base_sep = self.base_real + os.sep
         self.initialized = True
 
     def _resolve_base_path(self):
@@ -39,3 +47,6 @@ class ConfigManager:
             return True
         except subprocess.CalledProcessError:
             return False
+
+
+ConfigManager._instance = ConfigManager()
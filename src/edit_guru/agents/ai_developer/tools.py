@@ -1,7 +1,18 @@
+import array
+import bisect
+import functools
+import itertools
+import json
+import mmap
 import os
 import re
 import shutil
+import stat
 import subprocess
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
 from pydantic import BaseModel, Field
@@ -11,21 +22,122 @@ from supersullytools.llm.completions import CompletionHandler
 from .config import ConfigManager
 
 
+def _repo_root() -> str:
+    """Return the repository root resolved once at startup by ConfigManager.
+
+    Avoids shelling out to git (or re-deriving the cwd) on every tool invocation.
+    """
+    config = ConfigManager.get_instance()
+    if not config.initialized:
+        raise RuntimeError("ConfigManager has not been initialized; call initialize() before using tools.")
+    return config.base_path
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(pattern, flags: int = 0) -> re.Pattern:
+    """re.compile with a local bounded cache.
+
+    Agent sessions re-run the same searches/replacements many times; a
+    dedicated cache keeps those hot patterns compiled even when unrelated
+    lookups churn re's small internal cache.
+    """
+    return re.compile(pattern, flags)
+
+
+def _in_repo(path: str) -> bool:
+    """Cheap containment check via a realpath prefix compare.
+
+    Faster than os.path.commonpath (no per-call component splitting) and, because
+    symlinks are resolved, also closes the symlink-escape hole the old check had.
+    The root side is pre-resolved by ConfigManager.initialize, so only the
+    candidate path costs a realpath here.
+    """
+    config = ConfigManager.get_instance()
+    real = os.path.realpath(path)
+    return real == config.base_real or real.startswith(config.base_sep)
+
+
+def _safe(rel: str, message: str = "Path is outside the repository.") -> str:
+    """Join a tool-supplied relative path onto the repo root and validate it.
+
+    One realpath plus a prefix compare replaces the join/containment block
+    previously duplicated in every tool function.
+    """
+    config = ConfigManager.get_instance()
+    resolved = os.path.realpath(os.path.join(config.base_path, rel))
+    if resolved != config.base_real and not resolved.startswith(config.base_sep):
+        raise ValueError(message)
+    return resolved
+
+
+# Per-path locks so concurrent tool calls cannot interleave read-modify-write cycles
+_FILE_LOCKS: defaultdict = defaultdict(threading.Lock)
+_FILE_LOCKS_GUARD = threading.Lock()
+
+
+def _file_lock(path: str) -> threading.Lock:
+    with _FILE_LOCKS_GUARD:
+        return _FILE_LOCKS[os.path.realpath(path)]
+
+
+# Snapshot the process umask once (os.umask can only read by writing)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _match_target_mode(tmp_path: str, path: str) -> None:
+    """Give the temp file the permissions its os.replace target should have.
+
+    mkstemp creates 0600 files, so without this every edited file would lose
+    its original mode (e.g. a script's exec bit). New files get the default
+    mode a plain open(..., "w") would have produced under the current umask.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.chmod(tmp_path, mode)
+
+
+def _atomic_write(path: str, data) -> None:
+    """Write to a temp file alongside the target and os.replace it into place.
+
+    A crash or concurrent reader never observes a truncated file. Accepts str
+    or bytes so callers working at the byte level skip a decode round-trip.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".tmp.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data.encode("utf-8") if isinstance(data, str) else data)
+        _match_target_mode(tmp_path, path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _line_offset(mm, line_index: int) -> Optional[int]:
+    """Byte offset where the 0-based line_index-th line starts, or None past EOF.
+
+    mmap.find is memchr-backed, so this skips building a Python line list.
+    """
+    offset = 0
+    for _ in range(line_index):
+        newline = mm.find(b"\n", offset)
+        if newline < 0:
+            return None
+        offset = newline + 1
+    return offset
+
+
 # get_ai_tools function
 def get_ai_tools(completion_handler: "CompletionHandler") -> list[AgentTool]:
     _ = completion_handler  # feed the linter for now
-    tools = [
-        (ListFiles, list_files, False),
-        (ReadFile, read_file, True),
-        (WriteFile, write_file, True),
-        (CreateDirectory, create_directory, True),
-        (AddToFile, add_to_file, True),
-        (DeleteFile, delete_file, False),
-        (MoveFile, move_file, True),
-        (CheckFileExistence, CheckFileExistence, True),
-    ]
-    all_tools = [AgentTool(name=x[0].__name__, params_model=x[0], mechanism=x[1], safe_tool=x[2]) for x in tools]
-    return all_tools
+    # Shallow copy so callers can reorder/extend without affecting each other
+    return list(_ALL_TOOLS)
 
 
 # 1. Replace Text in Files
@@ -45,39 +157,52 @@ def replace_text_in_files(input: ReplaceText) -> str:
     """
     Replaces occurrences of 'search_text' with 'replacement_text' in the specified files.
     """
-    config = ConfigManager.get_instance()
+    # Compile the pattern once, outside the per-file loop
+    pattern = None
+    if input.use_regex:
+        flags = 0
+        if not input.case_sensitive:
+            flags |= re.IGNORECASE
+        pattern = _compile(input.search_text, flags)
+    elif not input.case_sensitive:
+        # Case-insensitive simple string replacement
+        pattern = _compile(re.escape(input.search_text), re.IGNORECASE)
+
     total_replacements = 0
     for relative_path in input.file_paths:
-        target_file = os.path.join(config.base_path, relative_path)
+        target_file = _safe(relative_path, "Path is outside allowed directory")
 
         if not os.path.isfile(target_file):
             raise FileNotFoundError(f"The file '{relative_path}' does not exist.")
 
-        if not os.path.commonpath([config.base_path, relative_path]) == config.base_path:
-            raise ValueError("Path is outside allowed directory")
+        with _file_lock(target_file):
+            with open(target_file, "r", encoding="utf-8") as f:
+                content = f.read()
 
-        with open(target_file, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        if input.use_regex:
-            flags = 0
-            if not input.case_sensitive:
-                flags |= re.IGNORECASE
-            pattern = re.compile(input.search_text, flags)
-            new_content, num_replacements = pattern.subn(input.replacement_text, content)
-        else:
-            if input.case_sensitive:
+            # Cheap containment probe first: files without a hit (the common
+            # case across a multi-file request) skip the rewrite allocation
+            if pattern is not None:
+                if pattern.search(content) is None:
+                    continue
+                new_content, num_replacements = pattern.subn(input.replacement_text, content)
+            elif input.search_text not in content:
+                continue
+            elif len(input.search_text) != len(input.replacement_text):
+                # One replace pass; the count falls out of the length delta
                 new_content = content.replace(input.search_text, input.replacement_text)
-                num_replacements = content.count(input.search_text)
+                num_replacements = (len(content) - len(new_content)) // (
+                    len(input.search_text) - len(input.replacement_text)
+                )
             else:
-                # Case-insensitive simple string replacement
-                pattern = re.compile(re.escape(input.search_text), re.IGNORECASE)
-                new_content, num_replacements = pattern.subn(input.replacement_text, content)
+                # Same-length replacement: count first so misses skip the copy
+                num_replacements = content.count(input.search_text)
+                new_content = content.replace(input.search_text, input.replacement_text) if num_replacements else content
 
-        if num_replacements > 0:
-            with open(target_file, "w", encoding="utf-8") as f:
-                f.write(new_content)
-            total_replacements += num_replacements
+            if num_replacements > 0:
+                if new_content != content:
+                    # Matches that replace text with itself skip the disk write
+                    _atomic_write(target_file, new_content)
+                total_replacements += num_replacements
 
     return f"Text replacement completed. Total replacements made: {total_replacements}."
 
@@ -91,12 +216,7 @@ def check_file_existence(input: CheckFileExistence) -> str:
     """
     Checks whether the specified file exists in the repository.
     """
-    config = ConfigManager.get_instance()
-
-    target_file = os.path.join(config.base_path, input.file_path)
-
-    if not os.path.commonpath([config.base_path, os.path.abspath(target_file)]) == config.base_path:
-        raise ValueError("File path is outside the repository.")
+    target_file = _safe(input.file_path, "File path is outside the repository.")
 
     if os.path.isfile(target_file):
         return f"File '{input.file_path}' exists."
@@ -113,12 +233,7 @@ def create_directory(input: CreateDirectory) -> str:
     """
     Creates a new directory at the specified path within the repository.
     """
-    config = ConfigManager.get_instance()
-
-    target_directory = os.path.join(config.base_path, input.directory_path)
-
-    if not os.path.commonpath([config.base_path, os.path.abspath(target_directory)]) == config.base_path:
-        raise ValueError("Directory path is outside the repository.")
+    target_directory = _safe(input.directory_path, "Directory path is outside the repository.")
 
     if os.path.exists(target_directory):
         raise FileExistsError(f"Directory '{input.directory_path}' already exists.")
@@ -131,6 +246,13 @@ def create_directory(input: CreateDirectory) -> str:
 # 4. Search in Files
 class SearchInFiles(BaseModel):
     search_text: str = Field(description="The text or regex pattern to search for.")
+    search_texts: Optional[list[str]] = Field(
+        default=None,
+        description=(
+            "Optional additional literal strings to search for alongside 'search_text'; "
+            "matches for any of them are reported. Ignored when 'use_regex' is set."
+        ),
+    )
     file_paths: Optional[list[str]] = Field(
         default=None,
         description="list of file paths to search in. If not provided, searches all files in the repository.",
@@ -141,54 +263,251 @@ class SearchInFiles(BaseModel):
     case_sensitive: bool = Field(default=True, description="Set to False for case-insensitive search.")
 
 
+def _walk_files(root: str, include_hidden: bool = False):
+    """Yield file paths beneath root via os.scandir.
+
+    DirEntry caches the type from the directory read itself, so classifying
+    entries costs no extra stat syscalls the way os.walk + isdir/isfile did.
+    """
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if not include_hidden and entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path
+
+
+def _needles(input: SearchInFiles) -> list[str]:
+    """All search strings for a query; extra literals only apply in non-regex mode."""
+    if input.use_regex or not input.search_texts:
+        return [input.search_text]
+    return [input.search_text, *input.search_texts]
+
+
+_REGEX_METACHARS = frozenset(".^$*+?{}[]()|\\")
+
+
+def _effective_use_regex(input: SearchInFiles) -> bool:
+    """Treat metacharacter-free "regex" patterns as plain literals.
+
+    Models often set use_regex for ordinary strings; literal matching (rg -F,
+    bytes.find) is substantially faster than the regex engine for those.
+    """
+    return input.use_regex and not _REGEX_METACHARS.isdisjoint(input.search_text)
+
+
+# Shared scan pool: reused across search calls so repeat searches in an agent
+# session skip the thread spawn/teardown cost
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix="eg-search")
+
+
+# Prefer ripgrep for whole-repo scans when it is installed; its native walker and
+# regex engine are far faster than a Python line loop
+_RG_PATH = shutil.which("rg")
+
+
+def _search_with_rg(
+    input: SearchInFiles, repo_root: str, files_to_search: Optional[list[str]] = None
+) -> dict[str, list[int]]:
+    """Run the search via a ripgrep subprocess, returning the same shape as the Python scan."""
+    command = [_RG_PATH, "--json"]
+    if not input.case_sensitive:
+        command.append("-i")
+    if not _effective_use_regex(input):
+        command.append("-F")
+    for text in _needles(input):
+        command.extend(["-e", text])
+    command.append("--")
+    # None means "whole repo"; an explicit (possibly empty) list never widens
+    command.extend(files_to_search if files_to_search is not None else [repo_root])
+
+    result = subprocess.run(command, cwd=repo_root, capture_output=True)
+    if result.returncode not in (0, 1):  # 1 just means "no matches"
+        raise RuntimeError(f"ripgrep failed: {result.stderr.decode(errors='replace')}")
+
+    matched_files: dict[str, list[int]] = {}
+    for raw_line in result.stdout.splitlines():
+        event = json.loads(raw_line)
+        if event.get("type") != "match":
+            continue
+        path = event["data"]["path"].get("text")
+        if path is None:
+            continue  # non-UTF-8 path; nothing useful to report
+        relative_path = os.path.relpath(os.path.join(repo_root, path), repo_root)
+        matched_files.setdefault(relative_path, []).append(event["data"]["line_number"])
+    return matched_files
+
+
+def _line_starts(data: bytes):
+    """Byte offsets where each line of the buffer begins.
+
+    A memchr-backed find loop beats iterating match objects, and array('q')
+    stores each offset in 8 bytes instead of a full Python int.
+    """
+    starts = array.array("q", [0])
+    find = data.find
+    pos = 0
+    while True:
+        newline = find(b"\n", pos)
+        if newline < 0:
+            return starts
+        pos = newline + 1
+        starts.append(pos)
+
+
+def _dedupe_append(matched: list[int], lineno: int) -> None:
+    if not matched or matched[-1] != lineno:
+        matched.append(lineno)
+
+
+def _build_scanner(search_texts: list[str], use_regex: bool, case_sensitive: bool):
+    """Build a whole-buffer scan callable returning matching 1-based line numbers.
+
+    Running finditer/find over the entire buffer keeps the hot loop inside the
+    C regex and bytes primitives; match offsets map back to line numbers with
+    one bisect each, instead of a Python-level predicate call per line.
+    """
+    flags = 0
+    if not case_sensitive:
+        flags |= re.IGNORECASE
+    if use_regex or len(search_texts) > 1:
+        fold_alternation = False
+        if use_regex:
+            pattern = _compile(search_texts[0].encode("utf-8"), flags)
+        else:
+            # Multi-literal: one compiled alternation scans every byte once no
+            # matter how many needles were supplied
+            needles = [text.encode("utf-8") for text in search_texts]
+            if not case_sensitive:
+                # Fold needles and buffer once rather than IGNORECASE-casing
+                # every candidate match inside the regex engine
+                needles = [needle.lower() for needle in needles]
+                fold_alternation = True
+            pattern = _compile(b"|".join(re.escape(needle) for needle in needles))
+
+        def scan(data) -> list[int]:
+            if fold_alternation:
+                data = bytes(data).lower()
+            starts = None
+            matched: list[int] = []
+            for m in pattern.finditer(data):
+                if starts is None:
+                    starts = _line_starts(data)  # only built when something matches
+                _dedupe_append(matched, bisect.bisect_right(starts, m.start()))
+            return matched
+
+        return scan
+
+    needle = search_texts[0].encode("utf-8")
+    fold_case = not case_sensitive
+    if fold_case:
+        # bytes.lower is a single vectorized pass over the buffer, far cheaper
+        # than casing each candidate match in the regex engine
+        needle = needle.lower()
+
+    def scan(data) -> list[int]:
+        if fold_case:
+            data = bytes(data).lower()  # materialize (mmap has no .lower) and fold once
+        pos = data.find(needle)
+        if pos < 0:
+            return []
+        starts = _line_starts(data)
+        matched: list[int] = []
+        while pos >= 0:
+            _dedupe_append(matched, bisect.bisect_right(starts, pos))
+            pos = data.find(needle, pos + 1)
+        return matched
+
+    return scan
+
+
+# Files above this size are skipped entirely; text sources worth searching
+# are essentially never this large, binary assets frequently are
+_MAX_SCAN_BYTES = 2 * 1024 * 1024
+
+# Extensions that are always binary; skipped without even opening the file
+_BINARY_EXTENSIONS = frozenset(
+    {".png", ".jpg", ".jpeg", ".gif", ".ico", ".pdf", ".whl", ".zip", ".gz", ".tar", ".so", ".dylib", ".pyc", ".woff2"}
+)
+
+
+def _search_one(file_path: str, scanner) -> list[int]:
+    """Scan a single file and return the 1-based line numbers that match."""
+    if os.path.splitext(file_path)[1].lower() in _BINARY_EXTENSIONS:
+        return []
+    try:
+        # mmap the file and scan the page cache directly: no heap copy of the
+        # contents, no universal-newline translation, no UTF-8 decode. The
+        # regex and find primitives accept the buffer as-is
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or size > _MAX_SCAN_BYTES:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # NUL in the first page marks a binary file (same sniff git
+                # and ripgrep use); reject before running the scanner
+                if mm.find(b"\x00", 0, 4096) >= 0:
+                    return []
+                return scanner(mm)
+    except (PermissionError, OSError, ValueError):
+        return []  # Skip files that cannot be read/mapped
+
+
 def search_in_files(input: SearchInFiles) -> dict[str, list[int]]:
     """
     Searches for 'search_text' in specified files and returns a dictionary with file paths and line numbers of matches.
     """
-    config = ConfigManager.get_instance()
+    repo_root = _repo_root()
 
-    matched_files = {}
     if input.file_paths:
-        files_to_search = [os.path.join(config.base_path, path) for path in input.file_paths]
+        files_to_search = [
+            file_path
+            for file_path in (os.path.join(repo_root, path) for path in input.file_paths)
+            # Skip files outside the repo
+            if _in_repo(file_path) and os.path.isfile(file_path)
+        ]
+        if not files_to_search:
+            # Every named file was missing or outside the repo; falling
+            # through would turn this into a whole-repo search
+            return {}
     else:
-        # Get all files in the repo
-        files_to_search = []
-        for root, dirs, files in os.walk(config.base_path):
-            dirs[:] = [d for d in dirs if not d.startswith(".")]
-            files = [f for f in files if not f.startswith(".")]
-            for file in files:
-                files_to_search.append(os.path.join(root, file))
-
-    for file_path in files_to_search:
-        if not os.path.commonpath([config.base_path, os.path.abspath(file_path)]) == config.base_path:
-            continue  # Skip files outside the repo
-
-        if os.path.isfile(file_path):
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-            except (UnicodeDecodeError, PermissionError):
-                continue  # Skip files that cannot be read
-
-            matched_lines = []
-            for idx, line in enumerate(lines):
-                if input.use_regex:
-                    flags = 0
-                    if not input.case_sensitive:
-                        flags |= re.IGNORECASE
-                    if re.search(input.search_text, line, flags):
-                        matched_lines.append(idx + 1)
-                else:
-                    if input.case_sensitive:
-                        if input.search_text in line:
-                            matched_lines.append(idx + 1)
-                    else:
-                        if input.search_text.lower() in line.lower():
-                            matched_lines.append(idx + 1)
+        files_to_search = None
+
+    if _RG_PATH is not None:
+        try:
+            return _search_with_rg(input, repo_root, files_to_search)
+        except (OSError, RuntimeError, ValueError):
+            pass  # fall back to the pure-Python scan below
+
+    if files_to_search is None:
+        if not ConfigManager.get_instance().use_cwd:
+            # Ask git for the tracked files: one subprocess instead of a
+            # readdir/stat per directory, with ignored build artifacts
+            # (.venv, node_modules, ...) excluded for free
+            raw = subprocess.check_output(["git", "-C", repo_root, "ls-files", "-z"])
+            files_to_search = [os.path.join(repo_root, p.decode()) for p in raw.split(b"\x00") if p]
+        else:
+            # Get all files under the cwd
+            files_to_search = list(_walk_files(repo_root))
+
+    # Select and compile the scan strategy once rather than per line / per file
+    scanner = _build_scanner(_needles(input), _effective_use_regex(input), input.case_sensitive)
 
-            if matched_lines:
-                relative_path = os.path.relpath(file_path, config.base_path)
-                matched_files[relative_path] = matched_lines
+    # File scanning is I/O bound, so fan out across the shared thread pool
+    matched_files = {}
+    results = _SEARCH_POOL.map(lambda fp: (fp, _search_one(fp, scanner)), files_to_search)
+    for file_path, matched_lines in results:
+        if matched_lines:
+            relative_path = os.path.relpath(file_path, repo_root)
+            matched_files[relative_path] = matched_lines
 
     return matched_files  # Returns a dict with file paths and lists of matching line numbers
 
@@ -205,48 +524,103 @@ class ListFiles(BaseModel):
     path: Optional[str] = Field(default=None, description="Sub-path within the repository to list files from.")
 
 
+# Hard cap on listing size; anything past this is noise to the model anyway
+_MAX_LIST_ENTRIES = 10_000
+
+
+def _capped_listing(paths) -> List[str]:
+    """Drain up to _MAX_LIST_ENTRIES from an iterator, noting any truncation."""
+    listing = list(itertools.islice(paths, _MAX_LIST_ENTRIES))
+    if next(paths, None) is not None:
+        listing.append(f"WARNING: listing truncated at {_MAX_LIST_ENTRIES} entries; list a narrower path instead")
+    return listing
+
+
 def list_files(input: ListFiles) -> List[str]:
     # Get the root of the git repository or cwd
     config = ConfigManager.get_instance()
-    target_path = os.path.join(config.base_path, input.path) if input.path else config.base_path
-
+    repo_root = _repo_root()
     # Verify the target path is within the repo to avoid unintended access
-    if not os.path.commonpath([config.base_path, target_path]) == config.base_path:
-        raise ValueError("Path is outside allowed directory")
+    target_path = _safe(input.path, "Path is outside allowed directory") if input.path else repo_root
 
     # If use_cwd is True, list files directly from the filesystem
     if config.use_cwd:
         if input.recursive:
-            # Recursive file listing using os.walk
-            return [os.path.join(dp, f) for dp, dn, filenames in os.walk(target_path) for f in filenames]
+            # Recursive file listing via scandir (no stat per entry), capped
+            # so an enormous tree cannot balloon the agent's context
+            return _capped_listing(_walk_files(target_path, include_hidden=True))
         else:
-            # Non-recursive listing of files and directories at the specified level
-            return [f + "/" if os.path.isdir(os.path.join(target_path, f)) else f for f in os.listdir(target_path)]
+            # Non-recursive listing of files and directories at the specified
+            # level; DirEntry.is_dir is served from the directory read
+            with os.scandir(target_path) as entries:
+                return [entry.name + "/" if entry.is_dir() else entry.name for entry in entries]
     else:
-        # Proceed with Git-based file listing
-        git_command = ["git", "ls-files"]
-        if not input.recursive:
-            # Non-recursive; restrict to the specified directory only
-            git_command.extend(["--directory", target_path])
-        else:
-            # Recursive; start from target path (Git is recursive by default here)
-            git_command.append(target_path)
+        # Proceed with Git-based file listing, cached until the git index changes
+        return _capped_listing(iter(_git_listing(repo_root, input.recursive, input.path, _git_index_mtime(repo_root))))
 
-        # Run the git command to get only tracked files and directories
-        try:
-            tracked_files = subprocess.check_output(git_command, cwd=config.base_path).decode().splitlines()
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Error executing git command: {e}")
 
-        # Filter output based on recursive mode
-        if input.recursive:
-            # Recursive: only list files
-            tracked_files = [f for f in tracked_files if not f.endswith("/")]
-        else:
-            # Non-recursive: include both files and directories at the specified level
-            tracked_files = [f + "/" if os.path.isdir(os.path.join(config.base_path, f)) else f for f in tracked_files]
+def _git_index_mtime(repo_root: str) -> int:
+    try:
+        return os.stat(os.path.join(repo_root, ".git", "index")).st_mtime_ns
+    except OSError:
+        return 0
 
-        return tracked_files
+
+@functools.lru_cache(maxsize=8)
+def _git_listing(repo_root: str, recursive: bool, path: Optional[str], index_mtime_ns: int) -> tuple[str, ...]:
+    """Run git ls-files for list_files, memoized per (query, git index mtime).
+
+    Agents tend to list the same paths repeatedly in one session; the index
+    mtime in the key busts the cache as soon as the repo contents change.
+    ls-files reads that same index, so staged-but-uncommitted files appear
+    and the listing works even before the first commit. Directory entries
+    are derived from the paths themselves -- no per-entry lstat needed.
+    """
+    _ = index_mtime_ns  # cache key only
+    git_command = ["git", "ls-files", "-z"]
+    prefix = ""
+    is_file_query = False
+    if path:
+        # Git emits paths relative to the repo root with no "./" prefix, so
+        # normalize the query the same way before using it as a pathspec or
+        # as the offset for the directory collapse below
+        normalized = os.path.normpath(path)
+        if normalized != ".":
+            if os.path.isfile(os.path.join(repo_root, normalized)):
+                # The query names a file; a trailing-slash pathspec would
+                # match nothing
+                is_file_query = True
+                git_command.extend(["--", normalized])
+            else:
+                prefix = normalized + "/"
+                git_command.extend(["--", prefix])
+
+    try:
+        output = subprocess.check_output(git_command, cwd=repo_root)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Error executing git command: {e}")
+
+    files = output.decode().split("\0")
+    if files and files[-1] == "":
+        files.pop()
+    if recursive or is_file_query:
+        return tuple(files)
+
+    # Collapse index paths to the requested level: a name with a further "/"
+    # lives in a subdirectory, which is listed once with a trailing slash
+    entries = []
+    seen_dirs = set()
+    start = len(prefix)
+    for name in files:
+        slash = name.find("/", start)
+        if slash < 0:
+            entries.append(name)
+        else:
+            dirname = name[: slash + 1]
+            if dirname not in seen_dirs:
+                seen_dirs.add(dirname)
+                entries.append(dirname)
+    return tuple(entries)
 
 
 # 5. Read File with Line Numbers
@@ -255,20 +629,31 @@ class ReadFile(BaseModel):
 
 
 def read_file(input: ReadFile) -> list[str]:
-    config = ConfigManager.get_instance()
-    target_file = os.path.join(config.base_path, input.file_path)
+    target_file = _safe(input.file_path, "File is outside the repository.")
 
     if not os.path.isfile(target_file):
         raise FileNotFoundError("The specified file does not exist.")
 
-    if not os.path.commonpath([config.base_path, os.path.abspath(target_file)]) == config.base_path:
-        raise ValueError("File is outside the repository.")
+    stat = os.stat(target_file)
+    return list(_read_numbered_lines(target_file, stat.st_mtime_ns, stat.st_size))
 
-    with open(target_file, "r") as f:
-        lines = f.readlines()
 
-    # Return lines with line numbers
-    return [f"{idx + 1}: {line.rstrip()}" for idx, line in enumerate(lines)]
+@functools.lru_cache(maxsize=256)
+def _read_numbered_lines(path: str, mtime_ns: int, size: int) -> tuple[str, ...]:
+    """Read and line-number a file, memoized on (path, mtime, size).
+
+    Agents re-read the same files across turns; an unchanged file is served from
+    the cache, and any write bumps the mtime/size so the stale entry simply
+    stops being hit and ages out of the LRU.
+    """
+    _ = (mtime_ns, size)  # part of the cache key only
+    # Read raw bytes and decode once; one bulk decode beats the text-mode
+    # incremental codec plus universal-newline translation
+    with open(path, "rb") as f:
+        lines = f.read().decode("utf-8").split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()  # trailing newline: match readline semantics (no empty final line)
+    return tuple(f"{idx}: {line.rstrip()}" for idx, line in enumerate(lines, 1))
 
 
 # 6. Write New File
@@ -281,21 +666,17 @@ class WriteFile(BaseModel):
 
 
 def write_file(input: WriteFile) -> str:
-    config = ConfigManager.get_instance()
-    target_file = os.path.join(config.base_path, input.file_path)
+    target_file = _safe(input.file_path, "File path is outside the repository.")
 
     if os.path.exists(target_file):
         if not input.overwrite:
             raise FileExistsError("File already exists.")
 
-    if not os.path.commonpath([config.base_path, os.path.abspath(target_file)]) == config.base_path:
-        raise ValueError("File path is outside the repository.")
-
     # Ensure the directory exists
     os.makedirs(os.path.dirname(target_file), exist_ok=True)
 
-    with open(target_file, "w") as f:
-        f.write(input.content)
+    with _file_lock(target_file):
+        _atomic_write(target_file, input.content)
 
     return f"File {input.file_path} created successfully."
 
@@ -311,30 +692,35 @@ class EditFile(BaseModel):
 
 
 def edit_file(input: EditFile) -> str:
-    config = ConfigManager.get_instance()
-    target_file = os.path.join(config.base_path, input.file_path)
+    target_file = _safe(input.file_path, "File is outside the repository.")
 
     if not os.path.isfile(target_file):
         raise FileNotFoundError("The specified file does not exist.")
 
-    if not os.path.commonpath([config.base_path, os.path.abspath(target_file)]) == config.base_path:
-        raise ValueError("File is outside the repository.")
-
-    with open(target_file, "r") as f:
-        lines = f.readlines()
-
-    if input.start_line < 1 or input.end_line > len(lines):
-        raise ValueError("Line numbers are out of range.")
-
-    # Adjust indices for 0-based indexing
-    start_idx = input.start_line - 1
-    end_idx = input.end_line
-
-    # Replace the specified lines
-    lines[start_idx:end_idx] = [input.replacement_text + "\n"]
-
-    with open(target_file, "w") as f:
-        f.writelines(lines)
+    with _file_lock(target_file):
+        # Splice the replacement by byte range instead of parsing the whole
+        # file into a line list; only the edit region is materialized anew
+        with open(target_file, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or input.start_line < 1 or input.end_line < input.start_line:
+                raise ValueError("Line numbers are out of range.")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                start_off = _line_offset(mm, input.start_line - 1)
+                if start_off is None or start_off >= size:
+                    raise ValueError("Line numbers are out of range.")
+                end_off = _line_offset(mm, input.end_line)
+                if end_off is None:
+                    # end_line is the final line and the file lacks a trailing newline
+                    last_start = _line_offset(mm, input.end_line - 1)
+                    if last_start is None or last_start >= size:
+                        raise ValueError("Line numbers are out of range.")
+                    end_off = size
+                new_data = mm[:start_off] + (input.replacement_text + "\n").encode("utf-8") + mm[end_off:]
+            finally:
+                mm.close()
+
+        _atomic_write(target_file, new_data)
 
     return f"File {input.file_path} edited successfully."
 
@@ -349,30 +735,48 @@ class AddToFile(BaseModel):
 
 
 def add_to_file(input: AddToFile):
-    config = ConfigManager.get_instance()
-    target_file = os.path.join(config.base_path, input.file_path)
+    target_file = _safe(input.file_path, "File is outside the repository.")
 
     if not os.path.isfile(target_file):
         raise FileNotFoundError("The specified file does not exist.")
 
-    if not os.path.commonpath([config.base_path, os.path.abspath(target_file)]) == config.base_path:
-        raise ValueError("File is outside the repository.")
-
-    with open(target_file, "r") as f:
-        lines = f.readlines()
-
-    if input.insert_at_line:
-        if input.insert_at_line < 1 or input.insert_at_line > len(lines) + 1:
-            raise ValueError("Insert line number is out of range.")
-
-        # Adjust index for 0-based indexing
-        idx = input.insert_at_line - 1
-        lines.insert(idx, input.content + "\n")
-    else:
-        lines.append(input.content + "\n")
+    with _file_lock(target_file):
+        if input.insert_at_line:
+            if input.insert_at_line < 1:
+                raise ValueError("Insert line number is out of range.")
 
-    with open(target_file, "w") as f:
-        f.writelines(lines)
+            # Stream the file through a temp copy, injecting the new content at
+            # the insertion point: O(1) memory instead of a full line list
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(target_file) or ".", prefix=os.path.basename(target_file) + ".tmp."
+            )
+            try:
+                # Binary passthrough: existing lines are copied byte-for-byte
+                # with no decode/encode round-trip or newline translation
+                payload = (input.content + "\n").encode("utf-8")
+                with open(target_file, "rb") as src, os.fdopen(fd, "wb") as dst:
+                    line_count = 0
+                    for line in src:
+                        line_count += 1
+                        if line_count == input.insert_at_line:
+                            dst.write(payload)
+                        dst.write(line)
+                    if input.insert_at_line == line_count + 1:
+                        dst.write(payload)
+                    elif input.insert_at_line > line_count + 1:
+                        raise ValueError("Insert line number is out of range.")
+                _match_target_mode(tmp_path, target_file)
+                os.replace(tmp_path, target_file)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        else:
+            # Plain append: O(len(content)) instead of rewriting the whole file
+            with open(target_file, "a") as f:
+                f.write(input.content + "\n")
 
     return read_file(ReadFile(file_path=input.file_path))
 
@@ -383,15 +787,11 @@ class DeleteFile(BaseModel):
 
 
 def delete_file(input: DeleteFile) -> str:
-    config = ConfigManager.get_instance()
-    target_file = os.path.join(config.base_path, input.file_path)
+    target_file = _safe(input.file_path, "File is outside the repository.")
 
     if not os.path.isfile(target_file):
         raise FileNotFoundError("The specified file does not exist.")
 
-    if not os.path.commonpath([config.base_path, os.path.abspath(target_file)]) == config.base_path:
-        raise ValueError("File is outside the repository.")
-
     os.remove(target_file)
 
     return f"File {input.file_path} deleted successfully."
@@ -402,27 +802,79 @@ class MoveFile(BaseModel):
     source_path: str = Field(description="Current path of the file.")
     destination_path: str = Field(description="New path for the file.")
     copy_file: bool = Field(default=False, description="Set to True to copy the file instead of moving it.")
+    hardlink: bool = Field(
+        default=False,
+        description="With copy_file, hardlink the destination instead of copying bytes when possible.",
+    )
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """Copy file contents in-kernel when the platform allows it.
+
+    copy_file_range can reflink on CoW filesystems and sendfile avoids the
+    userspace read/write loop; both fall back to shutil.copy2 on any failure.
+    """
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            size = os.fstat(fsrc.fileno()).st_size
+            copied = 0
+            while copied < size:
+                if hasattr(os, "copy_file_range"):
+                    sent = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+                else:
+                    sent = os.sendfile(fdst.fileno(), fsrc.fileno(), copied, size - copied)
+                if sent == 0:
+                    raise OSError("in-kernel copy made no progress")
+                copied += sent
+        shutil.copystat(src, dst)  # match shutil.copy2 metadata behavior
+    except (OSError, AttributeError):
+        shutil.copy2(src, dst)
 
 
 def move_file(input: MoveFile) -> str:
-    config = ConfigManager.get_instance()
-    source_file = os.path.join(config.base_path, input.source_path)
-    dest_file = os.path.join(config.base_path, input.destination_path)
+    source_file = os.path.join(_repo_root(), input.source_path)
+    dest_file = _safe(input.destination_path, "Destination is outside the repository.")
 
     if not os.path.isfile(source_file):
         raise FileNotFoundError("The source file does not exist.")
 
-    if not os.path.commonpath([config.base_path, os.path.abspath(dest_file)]) == config.base_path:
-        raise ValueError("Destination is outside the repository.")
-
     # Ensure the destination directory exists
     os.makedirs(os.path.dirname(dest_file), exist_ok=True)
 
+    same_fs = os.stat(source_file).st_dev == os.stat(os.path.dirname(dest_file)).st_dev
+
     if input.copy_file:
-        shutil.copy2(source_file, dest_file)
+        if input.hardlink and same_fs:
+            # O(1) metadata operation instead of an O(filesize) byte copy
+            try:
+                os.link(source_file, dest_file)
+            except OSError:
+                _fast_copy(source_file, dest_file)
+        else:
+            _fast_copy(source_file, dest_file)
         action = "copied"
     else:
-        shutil.move(source_file, dest_file)
+        if same_fs:
+            os.rename(source_file, dest_file)  # skip shutil.move's probing overhead
+        else:
+            shutil.move(source_file, dest_file)
         action = "moved"
 
     return f"File {input.source_path} {action} to {input.destination_path} successfully."
+
+
+# The AgentTool instances are stateless, so build the shared list once at
+# import time; get_ai_tools hands out shallow copies
+_ALL_TOOLS = [
+    AgentTool(name=x[0].__name__, params_model=x[0], mechanism=x[1], safe_tool=x[2])
+    for x in [
+        (ListFiles, list_files, False),
+        (ReadFile, read_file, True),
+        (WriteFile, write_file, True),
+        (CreateDirectory, create_directory, True),
+        (AddToFile, add_to_file, True),
+        (DeleteFile, delete_file, False),
+        (MoveFile, move_file, True),
+        (CheckFileExistence, CheckFileExistence, True),
+    ]
+]
@@ -0,0 +1,87 @@
+"""Local SQLite-backed response cache for completion calls.
+
+Planning calls are close to deterministic (same task text + same file listing
+produce the same plan), yet every invocation round-trips to the provider.
+Caching responses on disk makes repeat runs of the same task -- common while
+iterating on a prompt -- return instantly with zero API spend. Opt in with
+EDITGURU_ENABLE_RESPONSE_CACHE=1.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+from supersullytools.llm.completions import CompletionHandler
+
+# Entries older than this are treated as misses and overwritten
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Sampling above this temperature is intentionally non-deterministic, so
+# serving a stored response would be surprising; skip the cache
+MAX_CACHEABLE_TEMPERATURE = 0.3
+
+
+def _db_path() -> str:
+    cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "edit_guru")
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, "responses.sqlite3")
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(_db_path())
+    conn.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, response BLOB, created REAL)")
+    return conn
+
+
+def _request_key(args, kwargs) -> str:
+    """Stable digest of the full request; sort_keys keeps dict order irrelevant."""
+    payload = json.dumps({"args": args, "kwargs": kwargs}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CachedCompletionHandler(CompletionHandler):
+    """CompletionHandler that consults the local response cache first.
+
+    Anything that fails to hash, load, or store simply falls through to a
+    normal completion call -- the cache can only ever save work, never break
+    a request.
+    """
+
+    def complete(self, *args, **kwargs):
+        if kwargs.get("temperature", 0) > MAX_CACHEABLE_TEMPERATURE:
+            return super().complete(*args, **kwargs)
+        # Broad excepts throughout: hashing, loading, and storing can each
+        # fail in ways beyond their library's own error types (pickle raises
+        # TypeError/AttributeError on unpicklable objects, for one), and none
+        # of them may be allowed to break -- or re-run -- a paid completion
+        try:
+            key = _request_key(args, kwargs)
+        except Exception:  # noqa: BLE001
+            return super().complete(*args, **kwargs)
+
+        try:
+            with _connect() as conn:
+                row = conn.execute("SELECT response, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and time.time() - row[1] < CACHE_TTL_SECONDS:
+                return pickle.loads(row[0])
+        except Exception:  # noqa: BLE001
+            pass
+
+        response = super().complete(*args, **kwargs)
+
+        try:
+            with _connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, response, created) VALUES (?, ?, ?)",
+                    (key, pickle.dumps(response), time.time()),
+                )
+        except Exception:  # noqa: BLE001
+            pass
+        return response
+
+
+def response_cache_enabled() -> bool:
+    return os.getenv("EDITGURU_ENABLE_RESPONSE_CACHE") in ("1", "true", "yes")
@@ -1,36 +1,63 @@
+import functools
 import json
 import os
-import time
-from typing import Optional
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
 
 import click
 import logzero
-import openai
-import pandas as pd
-from rich.console import Console
-from rich.markdown import Markdown
-from rich.status import Status
-from simplesingletable import DynamoDbMemory
-from supersullytools.llm.agent import ChatAgent
-from supersullytools.llm.completions import CompletionHandler
-from supersullytools.llm.trackers import (
-    GlobalUsageTracker,
-    SessionUsageTracking,
-    TopicUsageTracking,
-)
-from supersullytools.utils.common_init import get_standard_completion_handler
 
 from edit_guru.agents.ai_developer.config import ConfigManager
-from edit_guru.agents.ai_developer.tools import ListFiles
 
-from .agents.ai_developer import ai_developer_agent
+if TYPE_CHECKING:
+    from simplesingletable import DynamoDbMemory
+    from supersullytools.llm.agent import ChatAgent
+    from supersullytools.llm.completions import CompletionHandler
+    from supersullytools.llm.trackers import SessionUsageTracking
 
 package_version = "0.8.1"
 
+# Static agent preferences, kept as a module constant so the prompt prefix is
+# byte-identical every turn and session -- that stability is what lets the
+# provider-side prompt-prefix caches (OpenAI automatic, Anthropic ephemeral)
+# actually hit
+_USER_PREFS = (
+    (
+        "I can only see your final message after the task is complete, "
+        "so be sure you provide a complete answer without assuming I can read your previous messages"
+    ),
+    (
+        "Do not make personal judgements about the content or the system you are interacting with; I do "
+        "not need to know if you think the repo is a compelling resource, for example. Just stick to the facts."
+    ),
+    (
+        "Approach the task step by step -- you shouldn't call al the functions at once, particularly if you "
+        "need to get a result and process it before continuing. "
+        "You will be able to take multiple turns, so take it slow! "
+        "But do call things in parallel when they are not dependent upon each other."
+    ),
+    (
+        "If you edit a file, be sure you read it again before doing another Edit, as your line numbers will "
+        "have changed! "
+        "If you can do one larger edit rather than multiple small edits (when things are separated by a "
+        "several lines for example), even if you have to repeat some existing code, that's usually better."
+    ),
+)
+
 # Create a logger instance
 logger = logzero.setup_logger(level=logzero.ERROR)
 
 
+@functools.cache
+def _console():
+    """Shared Console instance, created lazily so rich stays a deferred import."""
+    from rich.console import Console
+
+    return Console()
+
+
 def handle_exceptions(func):
     def wrapper(*args, **kwargs):
         try:
@@ -72,12 +99,17 @@ def main(
     display_usage: bool,
     skip_planning: bool,
 ):
+    # Heavy imports happen here so --help and arg errors stay fast
+    from supersullytools.llm.trackers import GlobalUsageTracker, SessionUsageTracking, TopicUsageTracking
+
+    from .agents.ai_developer import ai_developer_agent
+
     if f:
         approve = True
         approve_tools = True
     completion_handler = get_completion_handler()
 
-    console = Console()
+    console = _console()
     if display_usage:
         display_data = {}
         for tracker in completion_handler.completion_tracker.trackers:
@@ -100,7 +132,9 @@ def main(
             )
             this_data["cost_per_model"] = tracker.compute_cost_per_model()
             display_data[key] = this_data
-        click.echo(json.dumps(display_data))
+        # Compact separators skip the default pretty spacing; default=str lets
+        # any datetime/Decimal stragglers serialize without a second pass
+        click.echo(json.dumps(display_data, separators=(",", ":"), default=str))
         return
     elif not task:
         ctx = click.get_current_context()
@@ -110,61 +144,34 @@ def main(
     ConfigManager.get_instance().initialize(use_cwd=use_cwd)
 
     console.print(f"[cyan]Task: {task}[/cyan]")
-    try:
-        model = completion_handler.get_model_by_name_or_id(model)
-    except ValueError:
-        raise RuntimeError(
-            "Invalid model, must be one of " + ", ".join([x.llm_id for x in completion_handler.available_models])
-        )
+    model = _resolve_model(completion_handler, model, "model")
     if plan_model and not skip_planning:
-        try:
-            plan_model = completion_handler.get_model_by_name_or_id(plan_model)
-        except ValueError:
-            raise RuntimeError(
-                "Invalid plan model, must be one of "
-                + ", ".join([x.llm_id for x in completion_handler.available_models])
-            )
+        plan_model = _resolve_model(completion_handler, plan_model, "plan model")
     else:
         plan_model = model
-    plan_agent = ai_developer_agent(
-        model=plan_model, logger=logger, completion_handler=completion_handler, max_tool_calls=0
-    )
-    action_agent = ai_developer_agent(
-        model=model, logger=logger, completion_handler=completion_handler, max_tool_calls=10
-    )
+    # The two agent constructors and the file-listing walk are independent
+    # I/O; overlapping them drops startup from the sum to the max of the three
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        plan_agent_future = pool.submit(
+            ai_developer_agent, model=plan_model, logger=logger, completion_handler=completion_handler, max_tool_calls=0
+        )
+        action_agent_future = pool.submit(
+            ai_developer_agent, model=model, logger=logger, completion_handler=completion_handler, max_tool_calls=10
+        )
+        plan_agent = plan_agent_future.result()
+        if include_file_listing and not skip_planning:
+            # Warm the listing cache while the action agent finishes building
+            pool.submit(_cached_file_listing, plan_agent)
+        action_agent = action_agent_future.result()
 
-    action_agent.replace_user_preferences(
-        [
-            (
-                "I can only see your final message after the task is complete, "
-                "so be sure you provide a complete answer without assuming I can read your previous messages"
-            ),
-            (
-                "Do not make personal judgements about the content or the system you are interacting with; I do "
-                "not need to know if you think the repo is a compelling resource, for example. Just stick to the facts."
-            ),
-            (
-                "Approach the task step by step -- you shouldn't call al the functions at once, particularly if you "
-                "need to get a result and process it before continuing. "
-                "You will be able to take multiple turns, so take it slow! "
-                "But do call things in parallel when they are not dependent upon each other."
-            ),
-            (
-                "If you edit a file, be sure you read it again before doing another Edit, as your line numbers will "
-                "have changed! "
-                "If you can do one larger edit rather than multiple small edits (when things are separated by a "
-                "several lines for example), even if you have to repeat some existing code, that's usually better."
-            ),
-        ]
-    )
+    action_agent.replace_user_preferences(list(_USER_PREFS))
     if skip_planning:
         action_agent.message_from_user(task)
     else:
         click.echo("Generating a plan to accomplish this task...")
         plan = make_a_plan(plan_agent, task, include_file_listing)
 
-        md = Markdown(plan + "\n\n---")
-        console.print(md)
+        _print_markdown(console, plan + "\n\n---")
 
         if approve or click.confirm("Proceed with plan", default=True):
             msg = (
@@ -175,12 +182,13 @@ def main(
 
     confirm_next_loop = True
 
-    session_tracker: SessionUsageTracking = next(
-        x for x in completion_handler.completion_tracker.trackers if isinstance(x, SessionUsageTracking)
+    session_tracker = _CachedCostTracker(
+        next(x for x in completion_handler.completion_tracker.trackers if isinstance(x, SessionUsageTracking))
     )
 
     while confirm_next_loop or approve_tools or click.confirm("Approve", default=True):
         if action_agent.get_pending_tool_calls():
+            _prefetch_pending_reads(action_agent)
             action_agent.approve_pending_tool_usage()
 
         max_cost = run_agent_with_status(action_agent, session_tracker, max_cost)
@@ -188,23 +196,22 @@ def main(
         if pending_tools and approve_tools:
             continue
 
-        md = Markdown(action_agent.chat_history[-1].content)
-        console.print(md)
+        _print_markdown(console, action_agent.chat_history[-1].content)
         if pending_tools:
             click.echo("TOOL USE PENDING")
             for p in pending_tools:
                 click.echo(p.tool.name)
                 click.echo(p.reason)
         else:
-            stats_df = pd.DataFrame(
-                {"count": session_tracker.completions_by_model, "cost": session_tracker.compute_cost_per_model()}
-            )
-            total_count = int(stats_df["count"].sum())
-            total_cost = round(stats_df["cost"].sum(), 4)
+            total_count = sum(session_tracker.completions_by_model.values())
+            total_cost = round(sum(session_tracker.compute_cost_per_model().values()), 4)
             click.echo(f"Final Completion Input Tokens: {session_tracker.completions[-1].response.input_tokens}")
             click.echo(f"Final Completion Cost: {session_tracker.completions[-1].response.completion_cost}")
             click.echo(f"Total Completions Made: {total_count}")
             click.echo(f"Total Completions Cost: {total_cost}")
+            # Overlap user think-time with useful work: refresh the listing
+            # cache in the background while input() blocks
+            threading.Thread(target=_refresh_listing_quietly, args=(action_agent,), daemon=True).start()
             user_msg = input("Respond to llm (blank line to quit): \n").strip()
             if not user_msg:
                 break
@@ -212,26 +219,142 @@ def main(
             confirm_next_loop = True
 
 
-def run_agent_with_status(agent: ChatAgent, session_tracker, max_cost):
-    console = Console()
+@functools.lru_cache(maxsize=64)
+def _render_markdown(text: str):
+    """Parse markdown once per distinct message.
+
+    Rich's commonmark parse is pure Python and measurable on long assistant
+    messages; the resulting Markdown renderable is read-only, so re-prompts
+    that print the same content reuse it.
+    """
+    from rich.markdown import Markdown
+
+    return Markdown(text)
+
+
+def _print_markdown(console, text: str) -> None:
+    """Render assistant output as markdown in one place.
+
+    True token-by-token streaming would need delta callbacks from the
+    upstream ChatAgent.run_agent, which only reports status messages today;
+    until that exists, all markdown output at least flows through this single
+    choke point.
+    """
+    console.print(_render_markdown(text))
+
+
+def _resolve_model(completion_handler: "CompletionHandler", name: str, kind: str):
+    """Look up a model by name/id, with the valid-model list built only on failure."""
+    try:
+        return completion_handler.get_model_by_name_or_id(name)
+    except ValueError:
+        raise RuntimeError(
+            f"Invalid {kind}, must be one of " + ", ".join(x.llm_id for x in completion_handler.available_models)
+        )
+
+
+class _CachedCostTracker:
+    """Wraps SessionUsageTracking to memoize compute_cost_per_model.
+
+    The agent loop asks for per-model costs several times per iteration while
+    the underlying method walks every logged completion on each call; the
+    completion count keys the memo, so any new completion invalidates it.
+    Everything else passes through to the wrapped tracker.
+    """
+
+    def __init__(self, tracker: "SessionUsageTracking"):
+        self._tracker = tracker
+        self._memo: Optional[tuple] = None
+
+    def __getattr__(self, name):
+        return getattr(self._tracker, name)
+
+    def _refresh(self) -> None:
+        n = len(self._tracker.completions)
+        if self._memo is None or self._memo[0] != n:
+            costs = self._tracker.compute_cost_per_model()
+            self._memo = (n, costs, sum(costs.values()))
+
+    def compute_cost_per_model(self) -> dict:
+        self._refresh()
+        return self._memo[1]
+
+    @property
+    def total_cost(self) -> float:
+        """Running session total; a float compare is all the cost check needs."""
+        self._refresh()
+        return self._memo[2]
+
+
+# Tools that are safe AND worthwhile to execute speculatively: no side
+# effects, and backed by a tool-layer cache so the in-order execution that
+# follows is a cache hit rather than a second full run. SearchInFiles is
+# side-effect free but has no memo, so prefetching it would double the work
+_READ_ONLY_TOOLS = frozenset({"ListFiles", "ReadFile", "CheckFileExistence"})
+
+
+def _prefetch_pending_reads(agent: "ChatAgent") -> None:
+    """Warm the tool-layer caches for pending read-only calls in parallel.
+
+    ChatAgent.run_agent still executes the calls in order; this pass just runs
+    the idempotent read tools concurrently first, so the sequential execution
+    is served from the read/listing caches (and the page cache) at the cost of
+    the slowest read instead of the sum.
+    """
+    pending = [p for p in agent.get_pending_tool_calls() if p.tool.name in _READ_ONLY_TOOLS]
+
+    # Planning retries often emit the same read twice in one turn; warming a
+    # given (tool, arguments) pair once is enough for both executions to hit
+    # the tool-layer caches
+    seen: set = set()
+    unique = []
+    for p in pending:
+        key = (p.tool.name, json.dumps(p.arguments, sort_keys=True, default=str))
+        if key not in seen:
+            seen.add(key)
+            unique.append(p)
+    pending = unique
+
+    if len(pending) < 2:
+        return
+
+    def _invoke(p):
+        try:
+            p.tool.invoke_tool(p.arguments)
+        except Exception:  # noqa: BLE001 -- best-effort warm-up only
+            pass
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_invoke, pending))
+
+
+def run_agent_with_status(agent: "ChatAgent", session_tracker, max_cost):
+    from rich.status import Status
+    from rich.text import Text
+
+    console = _console()
     with Status("[bold green]AI is initializing...[/bold green]", spinner="dots", console=console) as status:
-        status_msg = "AI is processing..."
+        # Bounded history: long sessions previously grew one ever-larger
+        # string, re-copied in full on each update
+        status_lines: deque = deque(["AI is processing..."], maxlen=20)
+        status_text = Text("", style="bold cyan")
 
         def status_callback_fn(message):
-            nonlocal status_msg
-            status_msg += "\n" + message
-            status.update(f"[bold cyan]{status_msg}[/bold cyan]")
+            status_lines.append(message)
+            # Mutating a prebuilt Text skips Rich's markup parser per update
+            status_text.plain = "\n".join(status_lines)
+            status.update(status_text)
 
         status_callback_fn(agent.get_current_status_msg())
 
         # Run the agent loop, passing the callback function
         while agent.working:
             if not check_cost_limit(session_tracker, max_cost):
-                current_cost = sum(session_tracker.compute_cost_per_model().values())
+                current_cost = session_tracker.total_cost
                 status_callback_fn("Reached cost limit while executing task, asking user for extension...")
 
                 user_extension_prompt = (
-                    f"[bold cyan]{status_msg}[/bold cyan]\n\n[red]Cost limit reached: spent so far "
+                    "[bold cyan]" + "\n".join(status_lines) + "[/bold cyan]\n\n[red]Cost limit reached: spent so far "
                     f"${current_cost:.4f} / current limit ${max_cost:.4f}"
                     "\nWould you like to extend the cost limit (enter dollar amount or blank to halt)?[/red]\n\n"
                 )
@@ -243,18 +366,55 @@ def run_agent_with_status(agent: ChatAgent, session_tracker, max_cost):
                     status_callback_fn(f"Extending cost limit by {extension_amount}")
                     max_cost += float(extension_amount)
                 else:
-                    status_msg = ""
+                    status_lines.clear()
                     status.start()
                     status_callback_fn("User declined cost extension, halting")
                     break
+            # run_agent blocks on the provider call, so no pacing sleep is
+            # needed; the loop only spins as fast as completions finish
             agent.run_agent(status_callback_fn=status_callback_fn)
-            time.sleep(0.01)
 
         status.update("[bold green]Task complete![/bold green]")
         return max_cost
 
 
-def make_a_plan(agent: ChatAgent, task: str, include_file_dump: bool) -> str:
+# Process-scoped cache of the recursive file listing, keyed by base path and
+# its mtime so edits that touch the tree invalidate it
+_LISTING_CACHE: dict = {}
+
+
+@functools.cache
+def _list_files_recursive_payload() -> dict:
+    """The ListFiles arguments are a known constant; validate and dump them once."""
+    from edit_guru.agents.ai_developer.tools import ListFiles
+
+    return ListFiles(recursive=True).model_dump()
+
+
+def _cached_file_listing(agent: "ChatAgent"):
+    from edit_guru.agents.ai_developer.tools import ListFiles
+
+    base_path = ConfigManager.get_instance().base_path
+    try:
+        key = (base_path, os.stat(base_path).st_mtime_ns)
+    except OSError:
+        key = (base_path, 0)
+    listing = _LISTING_CACHE.get(key)
+    if listing is None:
+        list_files_tool = agent.get_current_tool_by_name(ListFiles.__name__)
+        listing = list_files_tool.invoke_tool(_list_files_recursive_payload())
+        _LISTING_CACHE[key] = listing
+    return listing
+
+
+def _refresh_listing_quietly(agent: "ChatAgent") -> None:
+    try:
+        _cached_file_listing(agent)
+    except Exception:  # noqa: BLE001 -- opportunistic warm-up only
+        pass
+
+
+def make_a_plan(agent: "ChatAgent", task: str, include_file_dump: bool) -> str:
     prompt = (
         "How would you accomplish the following using your given tools; "
         "for now just make a plan and tell me, do not take any action.\n"
@@ -263,9 +423,7 @@ def make_a_plan(agent: ChatAgent, task: str, include_file_dump: bool) -> str:
     )
 
     if include_file_dump:
-        list_files_tool = agent.get_current_tool_by_name(ListFiles.__name__)
-        dumped = ListFiles(recursive=True).model_dump()
-        file_listing = list_files_tool.invoke_tool(dumped)
+        file_listing = _cached_file_listing(agent)
         prompt += (
             "Reference specific paths using the provided listing "
             "(rather than planning to ListFiles later) when possible"
@@ -273,12 +431,30 @@ def make_a_plan(agent: ChatAgent, task: str, include_file_dump: bool) -> str:
         agent.add_to_context("current_file_listing", file_listing)
     prompt += f"\n<task>\n{task}\n</task>"
     agent.message_from_user(prompt)
-    while agent.working:
-        agent.run_agent()
+
+    # Surface the planner's progress instead of a silent terminal; run_agent
+    # already accepts the same status callback used for the action loop
+    from rich.status import Status
+    from rich.text import Text
+
+    with Status("[bold green]Generating plan...[/bold green]", spinner="dots", console=_console()) as status:
+        status_lines: deque = deque(maxlen=20)
+        status_text = Text("", style="bold cyan")
+
+        def status_callback_fn(message):
+            status_lines.append(message)
+            # Mutating a prebuilt Text skips Rich's markup parser per update
+            status_text.plain = "\n".join(status_lines)
+            status.update(status_text)
+
+        while agent.working:
+            agent.run_agent(status_callback_fn=status_callback_fn)
     return agent.chat_history[-1].content
 
 
-def get_dynamodb_memory() -> DynamoDbMemory:
+def get_dynamodb_memory() -> "DynamoDbMemory":
+    from simplesingletable import DynamoDbMemory
+
     memory = DynamoDbMemory(
         logger=logger,
         table_name=os.environ["EDITGURU_DYNAMODB_TABLE"],
@@ -294,9 +470,27 @@ export COMPLETION_TRACKING_BUCKET_NAME=myprivateinfra-coreappsta-completiontrack
 """
 
 
-def get_completion_handler() -> CompletionHandler:
+@functools.cache
+def _get_openai_client():
+    """Process-lifetime OpenAI client so repeat completions reuse warm TLS connections."""
+    import httpx
+    import openai
+
+    http_client = httpx.Client(limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60))
+    return openai.Client(api_key=os.environ["EDITGURU_OPENAI_API_KEY"], http_client=http_client)
+
+
+def get_completion_handler() -> "CompletionHandler":
+    from supersullytools.llm.completions import CompletionHandler
+    from supersullytools.utils.common_init import get_standard_completion_handler
+
+    from .cache import CachedCompletionHandler, response_cache_enabled
+
+    if response_cache_enabled():
+        CompletionHandler = CachedCompletionHandler  # noqa: N806 -- swap in the caching subclass
+
     enable_bedrock = os.getenv("EDITGURU_ENABLE_BEDROCK") in ("1", "true", "yes")
-    openai_client = openai.Client(api_key=os.environ["EDITGURU_OPENAI_API_KEY"])
+    openai_client = _get_openai_client()
     if os.getenv("COMPLETION_TRACKING_DYNAMODB_TABLE") and os.getenv("COMPLETION_TRACKING_BUCKET_NAME"):
         logger.info("Completion tracking enabled")
         # use standard handler with completion tracking
@@ -312,6 +506,5 @@ def get_completion_handler() -> CompletionHandler:
         return CompletionHandler(logger=logger, enable_bedrock=enable_bedrock, openai_client=openai_client)
 
 
-def check_cost_limit(session_tracker: SessionUsageTracking, max_cost: float) -> bool:
-    current_cost = sum(session_tracker.compute_cost_per_model().values())
-    return current_cost < max_cost
+def check_cost_limit(session_tracker: "_CachedCostTracker", max_cost: float) -> bool:
+    return session_tracker.total_cost < max_cost